@@ -1,7 +1,7 @@
 """Arm configuration definitions for different robot types."""
 
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 
 
@@ -186,14 +186,18 @@ def get_arm_config(config_id: str) -> Optional[ArmConfig]:
     return ARM_CONFIGS.get(config_id)
 
 
-def get_available_arms() -> List[Dict]:
+def get_available_arms() -> Tuple[Dict, ...]:
     """Get list of available arm configurations for frontend."""
-    return [
-        {
-            'id': config.id,
-            'name': config.name,
-            'description': config.description,
-            'dof': len(config.joints) + (1 if config.gripper_joint else 0)
-        }
-        for config in ARM_CONFIGS.values()
-    ]
\ No newline at end of file
+    return AVAILABLE_ARMS
+
+
+# Arm summaries for the frontend, built once at import time
+AVAILABLE_ARMS = tuple(
+    {
+        'id': config.id,
+        'name': config.name,
+        'description': config.description,
+        'dof': len(config.joints) + (1 if config.gripper_joint else 0)
+    }
+    for config in ARM_CONFIGS.values()
+)
@@ -2,9 +2,9 @@
 """Headless MuJoCo server with GPU rendering and web streaming."""
 
 import asyncio
-import base64
-import json
 import os
+import struct
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
@@ -14,14 +14,28 @@ os.environ['MUJOCO_GL'] = 'egl'
 # Try to use GPU 0 explicitly
 os.environ['MUJOCO_EGL_DEVICE_ID'] = '0'
 
+import cv2
 import mujoco
 import numpy as np
+import orjson
 from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
 import uvicorn
 
+try:
+    # libjpeg-turbo SIMD encoder, used in place of OpenCV when available
+    from turbojpeg import TurboJPEG, TJPF_RGB
+except ImportError:
+    TurboJPEG = None
+
+try:
+    # JIT compiles the gamepad kernel, which stays vectorized numpy without it
+    from numba import njit
+except ImportError:
+    njit = None
+
 try:
     from .arm_configs import ArmConfig, get_arm_config, get_available_arms
 except ImportError:
@@ -29,6 +43,104 @@ except ImportError:
     from arm_configs import ArmConfig, get_arm_config, get_available_arms
 
 
+# Rate at which frames are rendered and streamed to clients
+FRAME_INTERVAL = 1.0 / 30
+# Maximum number of unchanged frames skipped before one is resent anyway
+KEYFRAME_INTERVAL = 30
+# Binary frame header: JPEG length (uint32) and simulation time (float64),
+# followed by the JPEG bytes and the joint positions as float32
+FRAME_HEADER = struct.Struct('<Id')
+# Joints left out of the frontend controls
+HIDDEN_JOINTS = ("red_box_joint",)
+# Longest wait for the client to acknowledge a frame before sending the next
+FRAME_ACK_TIMEOUT = 1.0
+
+
+def _apply_gamepad_deltas_numpy(axis_values, multipliers, current, lo, hi, out):
+    """Write current + axis * multiplier, clipped to [lo, hi], into out.
+    
+    Joints without meaningful input keep their current value. Returns
+    whether any joint moved.
+    """
+    np.multiply(axis_values, multipliers, out=out)
+    moving = np.abs(out) > 0.001  # Only update if there's meaningful input
+    np.add(current, out, out=out)
+    np.clip(out, lo, hi, out=out)
+    np.copyto(out, current, where=~moving)
+    return bool(moving.any())
+
+
+def _apply_gamepad_deltas_loop(axis_values, multipliers, current, lo, hi, out):
+    """Scalar loop equivalent of _apply_gamepad_deltas_numpy, for Numba."""
+    moved = False
+    for i in range(axis_values.size):
+        delta = axis_values[i] * multipliers[i]
+        if abs(delta) > 0.001:  # Only update if there's meaningful input
+            out[i] = min(max(current[i] + delta, lo[i]), hi[i])
+            moved = True
+        else:
+            out[i] = current[i]
+    return moved
+
+
+if njit is not None:
+    # Compiled eagerly from the signature at import, so the first gamepad
+    # message doesn't stall the event loop on JIT compilation
+    apply_gamepad_deltas = njit(
+        'b1(f8[:], f8[:], f8[:], f8[:], f8[:], f8[:])', cache=True
+    )(_apply_gamepad_deltas_loop)
+else:
+    apply_gamepad_deltas = _apply_gamepad_deltas_numpy
+
+
+def _no_axis(deltas: dict, buttons: dict, gripper: Optional[str]) -> float:
+    return 0.0
+
+
+def _bumpers_axis(deltas: dict, buttons: dict, gripper: Optional[str]) -> float:
+    # Only LB is used for control, RB is used for precision mode
+    return -0.1 if buttons.get('lb', False) else 0.0
+
+
+def _dpad_x_axis(deltas: dict, buttons: dict, gripper: Optional[str]) -> float:
+    if buttons.get('dpadLeft', False):
+        return -0.1
+    if buttons.get('dpadRight', False):
+        return 0.1
+    return 0.0
+
+
+def _dpad_y_axis(deltas: dict, buttons: dict, gripper: Optional[str]) -> float:
+    if buttons.get('dpadUp', False):
+        return 0.1
+    if buttons.get('dpadDown', False):
+        return -0.1
+    return 0.0
+
+
+def _triggers_axis(deltas: dict, buttons: dict, gripper: Optional[str]) -> float:
+    # L2/R2 triggers for continuous rotation (screwdriver), these come
+    # through the gripper channel: R2 (RT) clockwise, L2 (LT) counter-clockwise
+    if gripper == 'open':
+        return 0.2
+    if gripper == 'close':
+        return -0.2
+    return 0.0
+
+
+# Gamepad delta for each JointMapping.control_axis
+GAMEPAD_AXIS_EXTRACTORS = {
+    'left_x': lambda deltas, buttons, gripper: deltas.get('x', 0),
+    'left_y': lambda deltas, buttons, gripper: deltas.get('y', 0),
+    'right_x': lambda deltas, buttons, gripper: deltas.get('wrist', 0),
+    'right_y': lambda deltas, buttons, gripper: deltas.get('z', 0),
+    'bumpers': _bumpers_axis,
+    'dpad_x': _dpad_x_axis,
+    'dpad_y': _dpad_y_axis,
+    'triggers': _triggers_axis,
+}
+
+
 class HeadlessMuJoCoServer:
     """MuJoCo simulation with headless GPU rendering."""
     
@@ -48,15 +160,27 @@ class HeadlessMuJoCoServer:
         self.data = mujoco.MjData(self.model)
         
         # Reset to home position if keyframe exists
+        self._home_key_id = None
         if self.model.nkey > 0:
             # Find 'home' keyframe or use first keyframe
             home_id = mujoco.mj_name2id(self.model, mujoco.mjtObj.mjOBJ_KEY, "home")
             if home_id < 0:
                 home_id = 0  # Use first keyframe if 'home' not found
+            self._home_key_id = home_id
             mujoco.mj_resetDataKeyframe(self.model, self.data, home_id)
         
         self.width = width
         self.height = height
+        self._jpeg_quality = 75
+        self._jpeg_params = [cv2.IMWRITE_JPEG_QUALITY, self._jpeg_quality]
+        
+        # Prefer libjpeg-turbo for encoding, fall back to OpenCV
+        self._turbojpeg = None
+        if TurboJPEG is not None:
+            try:
+                self._turbojpeg = TurboJPEG()
+            except (OSError, RuntimeError) as e:
+                print(f"Warning: libjpeg-turbo not available ({e}), using OpenCV JPEG encoding")
         
         # Create MuJoCo renderer - this should work with EGL backend
         try:
@@ -66,165 +190,208 @@ class HeadlessMuJoCoServer:
             print(f"Failed to create renderer: {e}")
             raise
         
+        # Reused for every frame's pixel readback and BGR conversion
+        self._pixel_buf = np.empty((height, width, 3), dtype=np.uint8)
+        self._bgr_buf = np.empty((height, width, 3), dtype=np.uint8)
+        
         # Set up camera from arm config
         self.cam = mujoco.MjvCamera()
-        cam_config = arm_config.default_camera
-        self.cam.lookat = np.array(cam_config['lookat'])
-        self.cam.distance = cam_config['distance']
-        self.cam.elevation = cam_config['elevation']
-        self.cam.azimuth = cam_config['azimuth']
+        self.update_camera(arm_config.default_camera)
         
-        # Control state
-        self.control_values = {}
+        # Cache name -> id lookups so the hot paths never scan the model
+        self._actuator_id_by_name = {}
+        for i in range(self.model.nu):
+            name = mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_ACTUATOR, i)
+            if name:
+                self._actuator_id_by_name[name] = i
+        
+        self._joint_id_by_name = {}
+        self._joint_qposadr_by_name = {}
+        for i in range(self.model.njnt):
+            name = mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_JOINT, i)
+            if name:
+                self._joint_id_by_name[name] = i
+                self._joint_qposadr_by_name[name] = int(self.model.jnt_qposadr[i])
+        self._joint_names = list(self._joint_id_by_name)
+        self._joint_qposadr_array = np.array(
+            list(self._joint_qposadr_by_name.values()), dtype=np.intp
+        )
+        
+        # Views onto the model arrays used per joint
+        self._joint_qposadr = self.model.jnt_qposadr
+        self._joint_limited = self.model.jnt_limited
+        self._joint_range = self.model.jnt_range
+        
+        # Static joint info served to the frontend controls
+        self._joint_info_template = [
+            (name, *self._joint_limits(joint_id))
+            for name, joint_id in self._joint_id_by_name.items()
+            if name not in HIDDEN_JOINTS
+        ]
+        self._joint_qposadr_filtered = np.array(
+            [self._joint_qposadr_by_name[info[0]] for info in self._joint_info_template],
+            dtype=np.intp
+        )
+        
+        # Physics steps batched between rendered frames
+        self.substeps = max(1, int(FRAME_INTERVAL / self.model.opt.timestep))
+        
+        # Control state, indexed by actuator id and copied into data.ctrl
+        # only when it has changed since the last step
+        self._ctrl_buffer = self.data.ctrl.copy()
+        self._ctrl_dirty = False
+        
+        # Joint limits per actuator (unbounded when the joint is unlimited)
+        self._limit_lo = np.full(self.model.nu, -np.inf)
+        self._limit_hi = np.full(self.model.nu, np.inf)
+        for name, actuator_id in self._actuator_id_by_name.items():
+            joint_id = self._joint_id_by_name.get(name)
+            if joint_id is not None and self._joint_limited[joint_id]:
+                self._limit_lo[actuator_id] = self._joint_range[joint_id][0]
+                self._limit_hi[actuator_id] = self._joint_range[joint_id][1]
+        
+        # Gamepad joint mappings that drive an actuator, with aligned limits
+        self._gamepad_mappings = [
+            j for j in arm_config.joints if j.name in self._actuator_id_by_name
+        ]
+        self._gamepad_actuator_ids = np.array(
+            [self._actuator_id_by_name[j.name] for j in self._gamepad_mappings],
+            dtype=np.intp
+        )
+        self._gamepad_lo = self._limit_lo[self._gamepad_actuator_ids]
+        self._gamepad_hi = self._limit_hi[self._gamepad_actuator_ids]
+        
+        # Axis extractor and signed speed multiplier for each mapping
+        self._gamepad_extractors = [
+            GAMEPAD_AXIS_EXTRACTORS.get(j.control_axis, _no_axis)
+            for j in self._gamepad_mappings
+        ]
+        self._gamepad_multipliers = np.array(
+            [(-1.0 if j.inverted else 1.0) * j.speed_multiplier for j in self._gamepad_mappings],
+            dtype=np.float64
+        )
         
-    def step(self):
-        """Advance simulation by one timestep."""
+        # Scratch arrays for the gamepad kernel
+        self._gamepad_axis_values = np.zeros(len(self._gamepad_mappings))
+        self._gamepad_targets = np.zeros(len(self._gamepad_mappings))
+        
+        # Gripper is skipped entirely if any joint uses triggers
+        self._gripper_actuator_id = None
+        has_trigger_control = any(j.control_axis == 'triggers' for j in arm_config.joints)
+        if arm_config.gripper_joint and not has_trigger_control:
+            self._gripper_actuator_id = self._actuator_id_by_name.get(arm_config.gripper_joint)
+        
+    def reset(self):
+        """Reset simulation state, controls and camera to their initial values."""
+        if self._home_key_id is not None:
+            mujoco.mj_resetDataKeyframe(self.model, self.data, self._home_key_id)
+        else:
+            mujoco.mj_resetData(self.model, self.data)
+        
+        np.copyto(self._ctrl_buffer, self.data.ctrl)
+        self._ctrl_dirty = False
+        
+        self.update_camera(self.arm_config.default_camera)
+    
+    def step(self, nstep: int = 1):
+        """Advance simulation by nstep timesteps."""
         # Apply controls
-        for name, value in self.control_values.items():
-            actuator_id = mujoco.mj_name2id(
-                self.model, mujoco.mjtObj.mjOBJ_ACTUATOR, name
-            )
-            if actuator_id >= 0:
-                self.data.ctrl[actuator_id] = value
+        if self._ctrl_dirty:
+            np.copyto(self.data.ctrl, self._ctrl_buffer)
+            self._ctrl_dirty = False
         
         # Step physics
-        mujoco.mj_step(self.model, self.data)
+        mujoco.mj_step(self.model, self.data, nstep=nstep)
         
     def render(self) -> bytes:
         """Render current state and return image as JPEG bytes."""
         # Update renderer with current simulation state
         self.renderer.update_scene(self.data, self.cam)
         
-        # Render to numpy array
-        pixels = self.renderer.render()
+        # Render into the preallocated pixel buffer
+        pixels = self.renderer.render(out=self._pixel_buf)
+        
+        # libjpeg-turbo takes RGB directly, no channel flip needed
+        if self._turbojpeg is not None:
+            return self._turbojpeg.encode(
+                pixels, quality=self._jpeg_quality, pixel_format=TJPF_RGB
+            )
         
-        # Convert RGB to JPEG bytes
-        import cv2
-        _, jpeg_bytes = cv2.imencode('.jpg', cv2.cvtColor(pixels, cv2.COLOR_RGB2BGR))
+        # Convert RGB to JPEG bytes, converting to BGR in a preallocated buffer
+        cv2.cvtColor(pixels, cv2.COLOR_RGB2BGR, dst=self._bgr_buf)
+        _, jpeg_bytes = cv2.imencode('.jpg', self._bgr_buf, self._jpeg_params)
         return jpeg_bytes.tobytes()
     
-    def get_state(self) -> dict:
-        """Get current simulation state."""
-        state = {
-            'time': self.data.time,
-            'qpos': self.data.qpos.tolist(),
-            'qvel': self.data.qvel.tolist(),
-        }
-        
-        # Add joint information
-        joints = {}
-        for i in range(self.model.njnt):
-            name = mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_JOINT, i)
-            if name:
-                qpos_addr = self.model.jnt_qposadr[i]
-                joints[name] = float(self.data.qpos[qpos_addr])
-        state['joints'] = joints
-        
-        return state
+    def render_frame(self) -> bytes:
+        """Render current state and pack it as a binary frame message."""
+        jpeg_bytes = self.render()
+        joint_positions = self.data.qpos[self._joint_qposadr_array].astype('<f4')
+        return (
+            FRAME_HEADER.pack(len(jpeg_bytes), self.data.time)
+            + jpeg_bytes
+            + joint_positions.tobytes()
+        )
+    
+    def scene_signature(self) -> int:
+        """Get a hash of the state that determines the rendered frame."""
+        return hash((
+            np.round(self.data.qpos, 3).tobytes(),
+            self.cam.lookat.tobytes(),
+            self.cam.distance,
+            self.cam.elevation,
+            self.cam.azimuth,
+        ))
     
     def set_control(self, control: dict):
         """Set control values."""
-        self.control_values.update(control)
+        for name, value in control.items():
+            actuator_id = self._actuator_id_by_name.get(name)
+            if actuator_id is not None:
+                self._ctrl_buffer[actuator_id] = value
+                self._ctrl_dirty = True
     
     def handle_gamepad_control(self, deltas: dict, gripper: Optional[str] = None, buttons: dict = None):
         """Handle gamepad control input using arm configuration mappings."""
-        # Get all available joint names
-        joint_names = self.get_joint_names()
-        
-        # Initialize control values if empty
-        if not self.control_values:
-            for name in joint_names:
-                actuator_id = mujoco.mj_name2id(
-                    self.model, mujoco.mjtObj.mjOBJ_ACTUATOR, name
-                )
-                if actuator_id >= 0:
-                    self.control_values[name] = self.data.ctrl[actuator_id]
+        buttons = buttons or {}
         
-        joint_values = {}
+        # Read each mapped joint's control axis
+        axis_values = self._gamepad_axis_values
+        for i, extractor in enumerate(self._gamepad_extractors):
+            axis_values[i] = extractor(deltas, buttons, gripper)
         
-        # Process joint mappings from arm config
-        for joint_mapping in self.arm_config.joints:
-            if joint_mapping.name not in self.control_values:
-                continue
-            
-            # Get delta value based on control axis
-            delta = 0.0
-            if joint_mapping.control_axis == 'left_x':
-                delta = deltas.get('x', 0)
-            elif joint_mapping.control_axis == 'left_y':
-                delta = deltas.get('y', 0)
-            elif joint_mapping.control_axis == 'right_x':
-                delta = deltas.get('wrist', 0)
-            elif joint_mapping.control_axis == 'right_y':
-                delta = deltas.get('z', 0)
-            elif joint_mapping.control_axis == 'bumpers' and buttons:
-                # Use bumpers for control (LB = negative, RB would be precision mode)
-                # Only use LB for actual control since RB is for precision
-                if buttons.get('lb', False):
-                    delta = -0.1
-                # Note: RB is used for precision mode, not for control
-            elif joint_mapping.control_axis == 'dpad_x' and buttons:
-                # D-pad left/right for control
-                if buttons.get('dpadLeft', False):
-                    delta = -0.1
-                elif buttons.get('dpadRight', False):
-                    delta = 0.1
-            elif joint_mapping.control_axis == 'dpad_y' and buttons:
-                # D-pad up/down for control
-                if buttons.get('dpadUp', False):
-                    delta = 0.1
-                elif buttons.get('dpadDown', False):
-                    delta = -0.1
-            elif joint_mapping.control_axis == 'triggers':
-                # L2/R2 triggers for continuous rotation (screwdriver)
-                # These come through the gripper channel
-                if gripper == 'open':  # R2 (RT) - clockwise
-                    delta = 0.2  # Continuous rotation speed
-                elif gripper == 'close':  # L2 (LT) - counter-clockwise
-                    delta = -0.2  # Continuous rotation speed
-            
-            # Apply inversion if needed
-            if joint_mapping.inverted:
-                delta = -delta
-            
-            # Apply speed multiplier
-            delta *= joint_mapping.speed_multiplier
-            
-            # Update joint value
-            if abs(delta) > 0.001:  # Only update if there's meaningful input
-                current_value = self.control_values.get(joint_mapping.name, 0)
-                joint_values[joint_mapping.name] = current_value + delta
-        
-        # Handle gripper control (skip entirely if any joint uses triggers)
-        has_trigger_control = any(
-            j.control_axis == 'triggers' for j in self.arm_config.joints
+        # Apply deltas and joint limits, then update control values
+        targets = self._gamepad_targets
+        moved = apply_gamepad_deltas(
+            axis_values,
+            self._gamepad_multipliers,
+            self._ctrl_buffer[self._gamepad_actuator_ids],
+            self._gamepad_lo,
+            self._gamepad_hi,
+            targets,
         )
+        if moved:
+            self._ctrl_buffer[self._gamepad_actuator_ids] = targets
+            self._ctrl_dirty = True
         
-        if gripper and self.arm_config.gripper_joint and not has_trigger_control:
-            gripper_joint = self.arm_config.gripper_joint
-            if gripper_joint in self.control_values:
-                if gripper == 'open':
-                    joint_values[gripper_joint] = self.arm_config.gripper_open_position
-                elif gripper == 'close':
-                    joint_values[gripper_joint] = self.arm_config.gripper_close_position
-                # 'stay' means don't change gripper
-        
-        # Apply joint limits
-        for name, value in joint_values.items():
-            # Get joint limits from model if available
-            joint_id = mujoco.mj_name2id(self.model, mujoco.mjtObj.mjOBJ_JOINT, name)
-            if joint_id >= 0 and self.model.jnt_limited[joint_id]:
-                min_limit = self.model.jnt_range[joint_id][0]
-                max_limit = self.model.jnt_range[joint_id][1]
-                joint_values[name] = np.clip(value, min_limit, max_limit)
-        
-        # Update control values
-        self.control_values.update(joint_values)
+        # Handle gripper control
+        gripper_id = self._gripper_actuator_id
+        if gripper and gripper_id is not None:
+            if gripper == 'open':
+                value = self.arm_config.gripper_open_position
+            elif gripper == 'close':
+                value = self.arm_config.gripper_close_position
+            else:
+                return  # 'stay' means don't change gripper
+            self._ctrl_buffer[gripper_id] = np.clip(
+                value, self._limit_lo[gripper_id], self._limit_hi[gripper_id]
+            )
+            self._ctrl_dirty = True
     
     def update_camera(self, camera_params: dict):
         """Update camera parameters."""
         if 'lookat' in camera_params:
-            self.cam.lookat = np.array(camera_params['lookat'])
+            # Write into the camera's own array rather than allocating a new one
+            self.cam.lookat[:] = camera_params['lookat']
         if 'distance' in camera_params:
             self.cam.distance = camera_params['distance']
         if 'elevation' in camera_params:
@@ -234,38 +401,58 @@ class HeadlessMuJoCoServer:
     
     def get_joint_names(self):
         """Get list of joint names."""
-        names = []
-        for i in range(self.model.njnt):
-            name = mujoco.mj_id2name(self.model, mujoco.mjtObj.mjOBJ_JOINT, i)
-            if name:
-                names.append(name)
-        return names
+        return self._joint_names
     
     def get_joint_info(self, joint_name: str):
         """Get detailed information about a joint."""
-        joint_id = mujoco.mj_name2id(self.model, mujoco.mjtObj.mjOBJ_JOINT, joint_name)
-        if joint_id < 0:
+        joint_id = self._joint_id_by_name.get(joint_name)
+        if joint_id is None:
             return None
         
-        qpos_addr = self.model.jnt_qposadr[joint_id]
+        qpos_addr = self._joint_qposadr[joint_id]
+        min_limit, max_limit, has_limits = self._joint_limits(joint_id)
         
+        return {
+            "name": joint_name,
+            "current_value": float(self.data.qpos[qpos_addr]),
+            "min": min_limit,
+            "max": max_limit,
+            "has_limits": has_limits
+        }
+    
+    def get_joints_info(self) -> list:
+        """Get detailed information about every joint shown in the frontend."""
+        values = self.data.qpos[self._joint_qposadr_filtered].tolist()
+        return [
+            {
+                "name": name,
+                "current_value": value,
+                "min": min_limit,
+                "max": max_limit,
+                "has_limits": has_limits
+            }
+            for (name, min_limit, max_limit, has_limits), value
+            in zip(self._joint_info_template, values)
+        ]
+    
+    def _joint_limits(self, joint_id: int) -> tuple:
+        """Get (min, max, has_limits) for a joint."""
         # Get joint limits if they exist
-        has_limits = self.model.jnt_limited[joint_id]
+        has_limits = bool(self._joint_limited[joint_id])
         if has_limits:
-            min_limit = self.model.jnt_range[joint_id][0]
-            max_limit = self.model.jnt_range[joint_id][1]
+            min_limit = float(self._joint_range[joint_id][0])
+            max_limit = float(self._joint_range[joint_id][1])
         else:
             # Default range for unlimited joints
             min_limit = -3.14
             max_limit = 3.14
-        
-        return {
-            "name": joint_name,
-            "current_value": float(self.data.qpos[qpos_addr]),
-            "min": float(min_limit),
-            "max": float(max_limit),
-            "has_limits": bool(has_limits)
-        }
+        return min_limit, max_limit, has_limits
+
+
+@lru_cache(maxsize=3)
+def load_sim_server(config_id: str) -> HeadlessMuJoCoServer:
+    """Get the simulation server for an arm configuration, reusing recent ones."""
+    return HeadlessMuJoCoServer(get_arm_config(config_id))
 
 
 # Create FastAPI app
@@ -303,69 +490,141 @@ async def startup_event():
         config_id = 'low_cost_6dof_screwdriver'  # Default to screwdriver
     
     # Get arm configuration
+    if not get_arm_config(config_id):
+        config_id = 'low_cost_6dof_screwdriver'  # Fallback to screwdriver
     arm_config = get_arm_config(config_id)
-    if not arm_config:
-        arm_config = get_arm_config('low_cost_6dof_screwdriver')  # Fallback to screwdriver
     
     print(f"Loading robot configuration: {arm_config.name}")
-    sim_server = HeadlessMuJoCoServer(arm_config)
+    sim_server = load_sim_server(config_id)
     current_arm_config = config_id
 
 
+async def send_message(websocket: WebSocket, message: dict):
+    """Send a JSON text message to the client, serialized with orjson."""
+    await websocket.send_text(orjson.dumps(message).decode('utf-8'))
+
+
+def handle_message(server: HeadlessMuJoCoServer, msg: dict):
+    """Apply a message received from the client to the simulation."""
+    if msg['type'] == 'control':
+        server.set_control(msg['data'])
+    elif msg['type'] == 'camera':
+        server.update_camera(msg['data'])
+    elif msg['type'] == 'gamepad_control':
+        server.handle_gamepad_control(
+            msg.get('deltas', {'x': 0, 'y': 0, 'z': 0, 'wrist': 0}),
+            msg.get('gripper'),
+            msg.get('buttons', {})
+        )
+
+
+async def receive_loop(websocket: WebSocket, inbox: asyncio.Queue, frame_acked: asyncio.Event):
+    """Receive client messages and queue control input for the physics loop."""
+    while True:
+        msg = orjson.loads(await websocket.receive_text())
+        if msg['type'] == 'frame_ack':
+            frame_acked.set()
+        elif msg['type'] == 'camera':
+            # Camera changes don't touch physics, apply them right away
+            sim_server.update_camera(msg['data'])
+        else:
+            inbox.put_nowait(msg)
+
+
+async def physics_loop(inbox: asyncio.Queue):
+    """Step the simulation in real time and apply queued client messages."""
+    loop = asyncio.get_running_loop()
+    next_tick = loop.time()
+    
+    while True:
+        server = sim_server
+        
+        # Apply messages received since the last batch
+        while not inbox.empty():
+            handle_message(server, inbox.get_nowait())
+        
+        # Step simulation one frame's worth of substeps at a time
+        server.step(server.substeps)
+        
+        # Schedule the next batch, dropping lag rather than spinning to catch up
+        next_tick = max(
+            next_tick + server.substeps * server.model.opt.timestep, loop.time()
+        )
+        await asyncio.sleep(next_tick - loop.time())
+
+
+async def render_loop(websocket: WebSocket, frame_acked: asyncio.Event):
+    """Render and send frames to the client at up to the frame rate."""
+    loop = asyncio.get_running_loop()
+    last_server = None
+    last_signature = None
+    frames_skipped = 0
+    
+    while True:
+        # Don't send another frame until the client has taken the last one
+        try:
+            await asyncio.wait_for(frame_acked.wait(), timeout=FRAME_ACK_TIMEOUT)
+        except asyncio.TimeoutError:
+            pass  # Client never acknowledged, send anyway
+        
+        frame_start = loop.time()
+        server = sim_server
+        
+        # Skip frames while the scene is unchanged, resending a keyframe periodically
+        signature = server.scene_signature()
+        if (
+            server is last_server
+            and signature == last_signature
+            and frames_skipped < KEYFRAME_INTERVAL
+        ):
+            frames_skipped += 1
+        else:
+            # Send the joint order for frame positions whenever the arm changes
+            if server is not last_server:
+                await send_message(
+                    websocket, {'type': 'joints', 'names': server.get_joint_names()}
+                )
+            
+            last_server = server
+            last_signature = signature
+            frames_skipped = 0
+            
+            # Send frame and joint positions as a single binary message
+            frame_acked.clear()
+            await websocket.send_bytes(server.render_frame())
+        
+        await asyncio.sleep(max(0.0, FRAME_INTERVAL - (loop.time() - frame_start)))
+
+
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
     """WebSocket endpoint for real-time communication."""
     await websocket.accept()
     
+    # Set when the client acknowledges a frame, throttling the render loop
+    frame_acked = asyncio.Event()
+    frame_acked.set()
+    
+    # Client messages waiting to be applied by the physics loop
+    inbox = asyncio.Queue()
+    
+    # Run receiving, physics and streaming independently so a slow frame
+    # never stalls physics
+    tasks = [
+        asyncio.create_task(receive_loop(websocket, inbox, frame_acked)),
+        asyncio.create_task(physics_loop(inbox)),
+        asyncio.create_task(render_loop(websocket, frame_acked)),
+    ]
+    
     try:
-        # Start simulation loop
-        while True:
-            # Step simulation
-            sim_server.step()
-            
-            # Render frame
-            jpeg_bytes = sim_server.render()
-            
-            # Get state
-            state = sim_server.get_state()
-            
-            # Send frame and state to client
-            message = {
-                'type': 'frame',
-                'image': base64.b64encode(jpeg_bytes).decode('utf-8'),
-                'state': state
-            }
-            await websocket.send_json(message)
-            
-            # Check for incoming messages (non-blocking)
-            try:
-                # Set timeout to match simulation timestep
-                data = await asyncio.wait_for(
-                    websocket.receive_text(), 
-                    timeout=sim_server.model.opt.timestep
-                )
-                
-                msg = json.loads(data)
-                if msg['type'] == 'control':
-                    sim_server.set_control(msg['data'])
-                elif msg['type'] == 'camera':
-                    sim_server.update_camera(msg['data'])
-                elif msg['type'] == 'gamepad_control':
-                    sim_server.handle_gamepad_control(
-                        msg.get('deltas', {'x': 0, 'y': 0, 'z': 0, 'wrist': 0}),
-                        msg.get('gripper'),
-                        msg.get('buttons', {})
-                    )
-                    
-            except asyncio.TimeoutError:
-                pass  # No message received, continue
-            
-            # Sleep to maintain real-time simulation
-            await asyncio.sleep(sim_server.model.opt.timestep)
-            
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
     except Exception as e:
         print(f"WebSocket error: {e}")
     finally:
+        for task in tasks:
+            task.cancel()
         await websocket.close()
 
 
@@ -388,15 +647,7 @@ async def get_joints():
     if not sim_server:
         return {"error": "Simulation not initialized"}
     
-    joints = []
-    for name in sim_server.get_joint_names():
-        # Skip the red box joint from frontend controls
-        if name == "red_box_joint":
-            continue
-        joint_info = sim_server.get_joint_info(name)
-        joints.append(joint_info)
-    
-    return {"joints": joints}
+    return {"joints": sim_server.get_joints_info()}
 
 
 @app.get("/api/arms")
@@ -420,9 +671,11 @@ async def switch_arm(arm_id: str):
         return {"error": f"Unknown arm configuration: {arm_id}"}
     
     try:
-        # Create new simulation server with the new arm
+        # Reuse a previously loaded server for the arm when possible,
+        # starting it from a fresh state
         print(f"Switching to arm configuration: {arm_config.name}")
-        sim_server = HeadlessMuJoCoServer(arm_config)
+        sim_server = load_sim_server(arm_id)
+        sim_server.reset()
         current_arm_config = arm_id
         
         return {
@@ -503,7 +756,14 @@ else:
 
 def main():
     """Main entry point for the backend server."""
-    uvicorn.run(app, host="0.0.0.0", port=1337)
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=1337,
+        loop="uvloop",
+        http="httptools",
+        ws="websockets",
+    )
 
 
 if __name__ == "__main__":
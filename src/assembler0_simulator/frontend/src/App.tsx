@@ -19,7 +19,7 @@ const { Title } = Typography;
 function App() {
   const [ws, setWs] = useState<SimulatorWebSocket | null>(null);
   const [connected, setConnected] = useState(false);
-  const [imageData, setImageData] = useState<string>();
+  const [imageData, setImageData] = useState<Blob>();
   const [state, setState] = useState<SimulationState>();
   const [cameraParams, setCameraParams] = useState<CameraParams>({
     distance: 1.5,
@@ -35,11 +35,9 @@ function App() {
     // Initialize WebSocket connection
     const websocket = new SimulatorWebSocket(`ws://${window.location.hostname}:1337/ws`);
     
-    websocket.onMessage((message) => {
-      if (message.type === 'frame') {
-        setImageData(message.image);
-        setState(message.state);
-      }
+    websocket.onFrame((frame, frameState) => {
+      setImageData(frame);
+      setState(frameState);
     });
 
     websocket.connect().then(() => {
@@ -3,7 +3,7 @@ import { Card, Tag } from 'antd';
 import { SimulationState, CameraParams } from '../types';
 
 interface VideoViewerProps {
-  imageData?: string;
+  imageData?: Blob;
   state?: SimulationState;
   connected: boolean;
   onCameraChange?: (params: Partial<CameraParams>) => void;
@@ -30,14 +30,13 @@ export const VideoViewer: React.FC<VideoViewerProps> = ({
     const ctx = canvas.getContext('2d');
     if (!ctx) return;
 
-    const img = new Image();
-    img.onload = () => {
+    createImageBitmap(imageData).then((bitmap) => {
       // Set canvas size to match image
-      canvas.width = img.width;
-      canvas.height = img.height;
-      ctx.drawImage(img, 0, 0);
-    };
-    img.src = `data:image/jpeg;base64,${imageData}`;
+      canvas.width = bitmap.width;
+      canvas.height = bitmap.height;
+      ctx.drawImage(bitmap, 0, 0);
+      bitmap.close();
+    });
   }, [imageData]);
 
   const handleMouseDown = (e: React.MouseEvent<HTMLCanvasElement>) => {
@@ -1,4 +1,7 @@
-import { WebSocketMessage, CameraParams } from '../types';
+import { WebSocketMessage, CameraParams, SimulationState } from '../types';
+
+// Binary frame header: JPEG length (uint32) and simulation time (float64)
+const FRAME_HEADER_SIZE = 12;
 
 let globalWebSocketInstance: SimulatorWebSocket | null = null;
 
@@ -6,6 +9,8 @@ export class SimulatorWebSocket {
   private ws: WebSocket | null = null;
   private reconnectTimeout: number | null = null;
   private messageHandlers: ((message: WebSocketMessage) => void)[] = [];
+  private frameHandlers: ((frame: Blob, state: SimulationState) => void)[] = [];
+  private jointNames: string[] = [];
 
   constructor(private url: string) {
     globalWebSocketInstance = this;
@@ -15,6 +20,7 @@ export class SimulatorWebSocket {
     return new Promise((resolve, reject) => {
       try {
         this.ws = new WebSocket(this.url);
+        this.ws.binaryType = 'arraybuffer';
 
         this.ws.onopen = () => {
           console.log('WebSocket connected');
@@ -22,8 +28,24 @@ export class SimulatorWebSocket {
         };
 
         this.ws.onmessage = (event) => {
+          // Frames arrive as binary messages
+          if (event.data instanceof ArrayBuffer) {
+            try {
+              this.handleFrame(event.data);
+            } catch (error) {
+              console.error('Error parsing frame:', error);
+            } finally {
+              // Always ack so a bad frame never stalls the stream
+              this.sendFrameAck();
+            }
+            return;
+          }
+
           try {
             const message = JSON.parse(event.data) as WebSocketMessage;
+            if (message.type === 'joints' && message.names) {
+              this.jointNames = message.names;
+            }
             this.messageHandlers.forEach(handler => handler(message));
           } catch (error) {
             console.error('Error parsing WebSocket message:', error);
@@ -64,6 +86,35 @@ export class SimulatorWebSocket {
     }
   }
 
+  private handleFrame(buffer: ArrayBuffer) {
+    const view = new DataView(buffer);
+    const jpegLength = view.getUint32(0, true);
+    const time = view.getFloat64(4, true);
+    const frame = new Blob(
+      [new Uint8Array(buffer, FRAME_HEADER_SIZE, jpegLength)],
+      { type: 'image/jpeg' }
+    );
+
+    // Joint positions follow the JPEG as float32, in the last announced order
+    const joints: Record<string, number> = {};
+    const offset = FRAME_HEADER_SIZE + jpegLength;
+    const count = Math.min(
+      Math.floor((buffer.byteLength - offset) / 4),
+      this.jointNames.length
+    );
+    for (let i = 0; i < count; i++) {
+      joints[this.jointNames[i]] = view.getFloat32(offset + i * 4, true);
+    }
+
+    this.frameHandlers.forEach(handler => handler(frame, { time, joints }));
+  }
+
+  private sendFrameAck() {
+    if (this.ws && this.ws.readyState === WebSocket.OPEN) {
+      this.ws.send(JSON.stringify({ type: 'frame_ack' }));
+    }
+  }
+
   sendCamera(params: CameraParams) {
     if (this.ws && this.ws.readyState === WebSocket.OPEN) {
       this.ws.send(JSON.stringify({
@@ -77,6 +128,10 @@ export class SimulatorWebSocket {
     this.messageHandlers.push(handler);
   }
 
+  onFrame(handler: (frame: Blob, state: SimulationState) => void) {
+    this.frameHandlers.push(handler);
+  }
+
   disconnect() {
     if (this.reconnectTimeout) {
       clearTimeout(this.reconnectTimeout);
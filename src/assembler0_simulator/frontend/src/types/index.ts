@@ -8,8 +8,6 @@ export interface JointInfo {
 
 export interface SimulationState {
   time: number;
-  qpos: number[];
-  qvel: number[];
   joints: Record<string, number>;
 }
 
@@ -21,9 +19,8 @@ export interface CameraParams {
 }
 
 export interface WebSocketMessage {
-  type: 'frame' | 'control' | 'camera' | 'gamepad_control';
-  image?: string;
-  state?: SimulationState;
+  type: 'joints' | 'control' | 'camera' | 'gamepad_control' | 'frame_ack';
+  names?: string[];
   data?: Record<string, any>;
   deltas?: {
     x: number;